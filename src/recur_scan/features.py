@@ -147,6 +147,7 @@ from recur_scan.features_emmanuel_ezechukwu1 import (
     get_percent_transactions_same_amount as get_percent_transactions_same_amount_emmanuel1,
 )
 from recur_scan.features_emmanuel_ezechukwu2 import (
+    build_feature_context,
     classify_subscription_tier,
     get_monthly_spending_trend,
     get_recurrence_patterns,
@@ -554,6 +555,9 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
 
     sequence_features = detect_sequence_patterns(transaction, all_transactions)
 
+    # Group transactions once for Emmanuel Ezechukwu (2)'s vendor and user features
+    ezechukwu2_ctx = build_feature_context(all_transactions)
+
     return {
         "n_transactions_same_amount": get_n_transactions_same_amount(transaction, all_transactions),
         "percent_transactions_same_amount": get_percent_transactions_same_amount(transaction, all_transactions),
@@ -655,14 +659,14 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
         "transaction_pattern_complexity": transaction_pattern_complexity(merchant_trans, interval_stats),
         "date_irregularity_dominance": date_irregularity_dominance(merchant_trans, interval_stats, amount_stats),
         # Emmanuel Ezechukwu (2)'s features
-        **get_recurrence_patterns(transaction, all_transactions),
-        **get_recurring_consistency_score(transaction, all_transactions),
+        **get_recurrence_patterns(transaction, all_transactions, ezechukwu2_ctx),
+        **get_recurring_consistency_score(transaction, all_transactions, ezechukwu2_ctx),
         "is_recurring": int(validate_recurring_transaction(transaction)),
         "subscription_tier": classify_subscription_tier(transaction),
-        **get_amount_features_emmanuel2(transaction, all_transactions),
-        **get_user_behavior_features(transaction, all_transactions),
-        **get_refund_features(transaction, all_transactions),
-        **get_monthly_spending_trend(transaction, all_transactions),
+        **get_amount_features_emmanuel2(transaction, all_transactions, ezechukwu2_ctx),
+        **get_user_behavior_features(transaction, all_transactions, ezechukwu2_ctx),
+        **get_refund_features(transaction, all_transactions, ezechukwu2_ctx),
+        **get_monthly_spending_trend(transaction, all_transactions, ezechukwu2_ctx),
         # Nnanna's features
         "time_interval_between_transactions": get_time_interval_between_transactions(transaction, all_transactions),
         "mobile_company": get_mobile_transaction(transaction),
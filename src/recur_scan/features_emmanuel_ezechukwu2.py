@@ -1,13 +1,16 @@
-from datetime import datetime
-from statistics import mean, stdev
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from typing import NamedTuple
 
 import numpy as np
 from fuzzywuzzy import process
 from sklearn.cluster import KMeans
 
 from recur_scan.transactions import Transaction
+from recur_scan.utils import parse_date_ordinal
 
-RECURRING_VENDORS = {
+RECURRING_VENDORS = frozenset({
     # Streaming & Entertainment
     "netflix",
     "spotify",
@@ -87,22 +90,224 @@ RECURRING_VENDORS = {
     "the economist",
     "linkedin premium",
     "audible",
+})
+
+# vendor -> {price: tier}
+SUBSCRIPTION_TIERS: dict[str, dict[float, int]] = {
+    "netflix": {8.99: 1, 15.49: 2, 19.99: 3},
+    "spotify": {9.99: 1, 12.99: 2, 15.99: 3},
+    "disney+": {7.99: 1, 13.99: 2},
+}
+
+
+class _VendorProfile(NamedTuple):
+    is_recurring_vendor: bool  # listed in RECURRING_VENDORS
+    tiers: dict[float, int]  # price -> subscription tier
+
+
+_DEFAULT_PROFILE = _VendorProfile(is_recurring_vendor=False, tiers={})
+
+# Every vendor classification in one place, so each lookup is a single hash probe
+_VENDOR_PROFILES: dict[str, _VendorProfile] = {
+    name: _VendorProfile(is_recurring_vendor=name in RECURRING_VENDORS, tiers=SUBSCRIPTION_TIERS.get(name, {}))
+    for name in RECURRING_VENDORS | SUBSCRIPTION_TIERS.keys()
 }
 
 
-def count_transactions_by_amount(transaction: Transaction, transactions: list[Transaction]) -> tuple[int, float]:
+class _IntervalStats(NamedTuple):
+    avg_days_between: float
+    std_days_between: float
+    recurrence_score: float
+    is_biweekly: bool
+    is_semimonthly: bool
+    is_monthly: bool
+    is_bimonthly: bool
+    is_quarterly: bool
+    is_annual: bool
+
+
+def _interval_stats(dates: np.ndarray) -> _IntervalStats:
+    """Summarizes the gaps between sorted date ordinals (at least two dates)."""
+    date_diffs = np.diff(dates)
+
+    avg_days_between = float(date_diffs.mean())
+    std_days_between = float(date_diffs.std(ddof=1)) if len(date_diffs) > 1 else 0.0
+
+    # Weighted recurrence score
+    recurrence_score = float((1 / (1 + np.abs(date_diffs - avg_days_between))).mean())
+
+    # Set every cadence flag in a single pass; the cadence ranges don't overlap apart from 14 days
+    is_biweekly = is_semimonthly = is_monthly = is_bimonthly = is_quarterly = is_annual = False
+    for diff in date_diffs.tolist():
+        if 14 <= diff <= 17:
+            is_semimonthly = True
+            is_biweekly = is_biweekly or diff == 14
+        elif 27 <= diff <= 31:
+            is_monthly = True
+        elif 55 <= diff <= 65:
+            is_bimonthly = True
+        elif 85 <= diff <= 95:
+            is_quarterly = True
+        elif 360 <= diff <= 370:
+            is_annual = True
+
+    return _IntervalStats(
+        avg_days_between=avg_days_between,
+        std_days_between=std_days_between,
+        recurrence_score=recurrence_score,
+        is_biweekly=is_biweekly,
+        is_semimonthly=is_semimonthly,
+        is_monthly=is_monthly,
+        is_bimonthly=is_bimonthly,
+        is_quarterly=is_quarterly,
+        is_annual=is_annual,
+    )
+
+
+@dataclass
+class VendorGroup:
+    dates: np.ndarray  # sorted date ordinals of the vendor's transactions
+    amounts: np.ndarray  # amounts of the vendor's transactions, in input order
+    amount_min: float  # smallest amount
+    amount_max: float  # largest amount
+
+    @cached_property
+    def interval_stats(self) -> _IntervalStats:
+        """Interval statistics for the vendor, computed on first use and shared by every transaction."""
+        return _interval_stats(self.dates)
+
+    @cached_property
+    def price_model(self) -> KMeans | None:  # type: ignore[no-any-unimported]
+        """KMeans fit over the vendor's amounts, fitted on first use; None when there is nothing to cluster."""
+        # Handle edge cases for KMeans clustering
+        if len(self.amounts) < 3 or self.amount_min == self.amount_max:
+            return None
+        n_unique_amounts = len(np.unique(self.amounts))
+        return KMeans(n_clusters=min(3, n_unique_amounts), random_state=42).fit(self.amounts.reshape(-1, 1))
+
+
+class TransactionTable(NamedTuple):
+    vendor_names: list[str]  # vendor name per name id
+    name_ids: np.ndarray  # int32 vendor name id per row
+    amounts: np.ndarray  # float64 amount per row
+    date_ords: np.ndarray  # int32 date ordinal per row
+
+
+@dataclass
+class FeatureContext:
+    by_name: dict[str, VendorGroup]  # vendor name -> that vendor's dates and amounts
+    by_user: dict[str, tuple[float, float, int]]  # user id -> (avg spent, total spent, subscription count)
+    amount_counts: Counter[float]  # amount -> number of transactions with that amount
+    date_sums_by_amount: dict[float, int]  # amount -> sum of date ordinals of transactions with that amount
+    spend_by_month: dict[str, float]  # YYYY-MM -> total amount spent that month
+
+
+def build_transaction_table(transactions: list[Transaction]) -> TransactionTable:
+    """Converts a list of transactions into contiguous per-field columns, parsing each date once.
+
+    Vendor names are interned as small int ids so grouping compares integers rather than strings.
+    """
+    name_to_id: dict[str, int] = {}
+    name_ids = [name_to_id.setdefault(t.name, len(name_to_id)) for t in transactions]
+    return TransactionTable(
+        vendor_names=list(name_to_id),
+        name_ids=np.array(name_ids, dtype=np.int32),
+        amounts=np.array([t.amount for t in transactions], dtype=np.float64),
+        date_ords=np.array([parse_date_ordinal(t.date) for t in transactions], dtype=np.int32),
+    )
+
+
+def _make_vendor_group(date_ords: np.ndarray, amounts: np.ndarray) -> VendorGroup:
+    """Builds a vendor group from one vendor's date ordinals and amounts (in input order)."""
+    return VendorGroup(
+        dates=np.sort(date_ords),
+        amounts=amounts,
+        amount_min=float(amounts.min()),
+        amount_max=float(amounts.max()),
+    )
+
+
+def _vendor_group(
+    transaction: Transaction, transactions: list[Transaction], ctx: FeatureContext | None
+) -> VendorGroup | None:
+    """Returns the transaction's vendor group from ctx, or builds only that group when there is no context."""
+    if ctx is not None:
+        return ctx.by_name.get(transaction.name)
+    vendor_txns = [t for t in transactions if t.name == transaction.name]
+    if not vendor_txns:
+        return None
+    return _make_vendor_group(
+        np.array([parse_date_ordinal(t.date) for t in vendor_txns], dtype=np.int32),
+        np.array([t.amount for t in vendor_txns], dtype=np.float64),
+    )
+
+
+def _user_stats(user_txns: list[Transaction]) -> tuple[float, float, int]:
+    """Returns (avg spent, total spent, subscription count) for one user's transactions."""
+    user_total_spent = sum(t.amount for t in user_txns)
+    # Subscriptions are counted per user
+    user_subscription_count = sum(_VENDOR_PROFILES.get(t.name, _DEFAULT_PROFILE).is_recurring_vendor for t in user_txns)
+    return user_total_spent / len(user_txns), user_total_spent, user_subscription_count
+
+
+def build_feature_context(transactions: list[Transaction]) -> FeatureContext:
+    """Builds the per-vendor groups and the per-user, per-amount and per-month aggregates the helpers look up.
+
+    The helpers then answer from these instead of re-filtering the transaction list on every call.
+    """
+    table = build_transaction_table(transactions)
+
+    # Per-amount aggregates are reductions over the amount and date columns
+    unique_amounts, amount_index, amount_counts = np.unique(table.amounts, return_inverse=True, return_counts=True)
+    date_sums = np.bincount(amount_index, weights=table.date_ords, minlength=len(unique_amounts))
+
+    # User and month keys are strings the table doesn't carry, and the month totals need sum()'s
+    # compensated summation to match a direct scan, so those two are grouped from the transactions
+    month_amounts: defaultdict[str, list[float]] = defaultdict(list)
+    user_txns: defaultdict[str, list[Transaction]] = defaultdict(list)
+    for t in transactions:
+        month_amounts[t.date[:7]].append(t.amount)
+        user_txns[t.user_id].append(t)
+
+    # Group rows by vendor id: a stable sort keeps each vendor's rows in input order
+    order = np.argsort(table.name_ids, kind="stable")
+    boundaries = np.flatnonzero(np.diff(table.name_ids[order])) + 1
+    by_name: dict[str, VendorGroup] = {}
+    for rows in np.split(order, boundaries):
+        if rows.size == 0:  # no transactions at all
+            continue
+        by_name[table.vendor_names[table.name_ids[rows[0]]]] = _make_vendor_group(
+            table.date_ords[rows], table.amounts[rows]
+        )
+    return FeatureContext(
+        by_name=by_name,
+        by_user={user_id: _user_stats(txns) for user_id, txns in user_txns.items()},
+        amount_counts=Counter(dict(zip(unique_amounts.tolist(), amount_counts.tolist(), strict=True))),
+        date_sums_by_amount=dict(zip(unique_amounts.tolist(), date_sums.astype(np.int64).tolist(), strict=True)),
+        spend_by_month={month: sum(amounts) for month, amounts in month_amounts.items()},
+    )
+
+
+def count_transactions_by_amount(
+    transaction: Transaction, transactions: list[Transaction], ctx: FeatureContext | None = None
+) -> tuple[int, float]:
     """Returns count and percentage of transactions with the same amount."""
     if not transactions:
         return 0, 0.0
-    same_amount_count = sum(1 for t in transactions if t.amount == transaction.amount)
+    if ctx is None:
+        same_amount_count = sum(1 for t in transactions if t.amount == transaction.amount)
+    else:
+        same_amount_count = ctx.amount_counts[transaction.amount]
     return same_amount_count, same_amount_count / len(transactions)
 
 
-def get_recurrence_patterns(transaction: Transaction, transactions: list[Transaction]) -> dict:
+def get_recurrence_patterns(
+    transaction: Transaction, transactions: list[Transaction], ctx: FeatureContext | None = None
+) -> dict:
     """Determines time-based recurrence patterns from past transactions."""
-    merchant_txns = [t for t in transactions if t.name == transaction.name]
+    group = _vendor_group(transaction, transactions, ctx)
 
-    if len(merchant_txns) < 2:
+    if group is None or len(group.dates) < 2:
         return {
             key: 0
             for key in [
@@ -118,175 +323,245 @@ def get_recurrence_patterns(transaction: Transaction, transactions: list[Transac
             ]
         }
 
-    dates = sorted(datetime.strptime(t.date, "%Y-%m-%d") for t in merchant_txns)
-    date_diffs = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
-
-    avg_days_between = mean(date_diffs)
-    std_days_between = stdev(date_diffs) if len(date_diffs) > 1 else 0.0
-
-    # Weighted recurrence score
-    recurrence_score = sum(1 / (1 + abs(diff - avg_days_between)) for diff in date_diffs) / len(date_diffs)
-
-    recurrence_flags = {
-        "is_biweekly": int(14 in date_diffs),
-        "is_semimonthly": int(any(d in {14, 15, 16, 17} for d in date_diffs)),
-        "is_monthly": int(any(27 <= d <= 31 for d in date_diffs)),
-        "is_bimonthly": int(any(55 <= d <= 65 for d in date_diffs)),
-        "is_quarterly": int(any(85 <= d <= 95 for d in date_diffs)),
-        "is_annual": int(any(360 <= d <= 370 for d in date_diffs)),
-    }
-
+    stats = group.interval_stats
     return {
-        **recurrence_flags,
-        "avg_days_between": avg_days_between,
-        "std_days_between": std_days_between,
-        "recurrence_score": recurrence_score,
+        "is_biweekly": int(stats.is_biweekly),
+        "is_semimonthly": int(stats.is_semimonthly),
+        "is_monthly": int(stats.is_monthly),
+        "is_bimonthly": int(stats.is_bimonthly),
+        "is_quarterly": int(stats.is_quarterly),
+        "is_annual": int(stats.is_annual),
+        "avg_days_between": stats.avg_days_between,
+        "std_days_between": stats.std_days_between,
+        "recurrence_score": stats.recurrence_score,
     }
 
 
-def get_recurring_consistency_score(transaction: Transaction, transactions: list[Transaction]) -> dict:
+def get_recurring_consistency_score(
+    transaction: Transaction, transactions: list[Transaction], ctx: FeatureContext | None = None
+) -> dict:
     """Computes a consistency score to minimize bias errors in recurring transaction detection."""
+    group = _vendor_group(transaction, transactions, ctx)
 
-    merchant_txns = [t for t in transactions if t.name == transaction.name]
-
-    if len(merchant_txns) < 2:
+    if group is None or len(group.dates) < 2:
         return {"recurring_consistency_score": 0.0}  # Not enough data to determine recurrence
 
-    dates = sorted(datetime.strptime(t.date, "%Y-%m-%d") for t in merchant_txns)
-    date_diffs = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
-
-    avg_days_between = mean(date_diffs)
-    std_days_between = stdev(date_diffs) if len(date_diffs) > 1 else 0.0
+    # Interval stats are shared with get_recurrence_patterns through the vendor group
+    stats = group.interval_stats
 
-    amount_variations = [t.amount for t in merchant_txns]
-    amount_stability = 1 - (stdev(amount_variations) / (mean(amount_variations) + 1e-6))  # Normalize stability score
+    # Normalize stability score (sample std, as statistics.stdev)
+    amount_stability = 1 - (float(group.amounts.std(ddof=1)) / (float(group.amounts.mean()) + 1e-6))
 
     # Frequency-based confidence (e.g., monthly = strong, yearly = weaker)
-    recurrence_flags = {
-        "biweekly": int(14 in date_diffs),
-        "monthly": int(any(27 <= d <= 31 for d in date_diffs)),
-        "bimonthly": int(any(55 <= d <= 65 for d in date_diffs)),
-        "quarterly": int(any(85 <= d <= 95 for d in date_diffs)),
-        "annual": int(any(360 <= d <= 370 for d in date_diffs)),
-    }
-
-    # Weight factors based on common recurrence patterns
     recurrence_weight = (
-        0.4 * recurrence_flags["monthly"]
-        + 0.2 * recurrence_flags["biweekly"]
-        + 0.15 * recurrence_flags["bimonthly"]
-        + 0.1 * recurrence_flags["quarterly"]
-        + 0.05 * recurrence_flags["annual"]
+        0.4 * stats.is_monthly
+        + 0.2 * stats.is_biweekly
+        + 0.15 * stats.is_bimonthly
+        + 0.1 * stats.is_quarterly
+        + 0.05 * stats.is_annual
     )
 
     # Final consistency score (scales from 0 to 1)
     consistency_score = (
         0.5 * amount_stability  # Amount consistency
-        + 0.3 * (1 - (std_days_between / (avg_days_between + 1e-6)))  # Time interval consistency
+        + 0.3 * (1 - (stats.std_days_between / (stats.avg_days_between + 1e-6)))  # Time interval consistency
         + 0.2 * recurrence_weight  # Frequency confidence
     )
 
     return {"recurring_consistency_score": round(max(0, min(consistency_score, 1)), 2)}
 
 
+@lru_cache(maxsize=4096)
+def _vendor_match_score(vendor_name: str) -> int | None:
+    """Fuzzy-match a lowercased vendor name against RECURRING_VENDORS, once per unique name."""
+    # An exact hit always scores 100, so skip the fuzzy scan
+    if _VENDOR_PROFILES.get(vendor_name, _DEFAULT_PROFILE).is_recurring_vendor:
+        return 100
+    match_result: tuple[str, int] | None = process.extractOne(vendor_name, RECURRING_VENDORS)
+    return match_result[1] if match_result is not None else None
+
+
 def validate_recurring_transaction(transaction: Transaction, threshold: int = 80) -> bool:
     """Determines if a transaction should be classified as recurring based on vendor trends."""
-    vendor_name = transaction.name.lower()
-
     # Fuzzy Matching for Vendor Detection
-    match_result: tuple[str, int] | None = process.extractOne(vendor_name, RECURRING_VENDORS)
+    score = _vendor_match_score(transaction.name.lower())
 
     # If no match is found, return False
-    if match_result is None:
+    if score is None:
         return False
 
-    # Extract the best match and its score
-    best_match, score = match_result
-
     # Return True if the score is above the threshold
     return score > threshold
 
 
 def classify_subscription_tier(transaction: Transaction) -> int:
     """Dynamically classifies a transaction's subscription tier."""
-    subscription_tiers = {
-        "netflix": [(8.99, 1), (15.49, 2), (19.99, 3)],
-        "spotify": [(9.99, 1), (12.99, 2), (15.99, 3)],
-        "disney+": [(7.99, 1), (13.99, 2)],
-    }
-
-    vendor_name = transaction.name.lower()
-    amount = transaction.amount
+    return _VENDOR_PROFILES.get(transaction.name.lower(), _DEFAULT_PROFILE).tiers.get(transaction.amount, 0)
 
-    return next((tier for price, tier in subscription_tiers.get(vendor_name, []) if price == amount), 0)
 
-
-def get_amount_features(transaction: Transaction, transactions: list[Transaction]) -> dict:
+def get_amount_features(
+    transaction: Transaction, transactions: list[Transaction], ctx: FeatureContext | None = None
+) -> dict:
     """Extracts features related to amount stability using clustering."""
-    vendor_txns = [t.amount for t in transactions if t.name == transaction.name]
+    group = _vendor_group(transaction, transactions, ctx)
 
-    if not vendor_txns:
+    if group is None:
         return {"is_fixed_amount_recurring": 0, "amount_fluctuation": 0.0, "price_cluster": -1}
 
-    price_fluctuation = max(vendor_txns) - min(vendor_txns)
+    price_fluctuation = group.amount_max - group.amount_min
+    is_fixed_amount_recurring = int(group.amount_max <= group.amount_min * 1.02)
 
-    # Handle edge cases for KMeans clustering
-    if len(vendor_txns) < 3 or len(set(vendor_txns)) == 1:
+    # The model is fitted once per vendor group; only the prediction is per transaction
+    kmeans = group.price_model
+    if kmeans is None:
         return {
-            "is_fixed_amount_recurring": int(max(vendor_txns) <= min(vendor_txns) * 1.02),
+            "is_fixed_amount_recurring": is_fixed_amount_recurring,
             "amount_fluctuation": price_fluctuation,
             "price_cluster": -1,  # Indicates clustering was not performed
         }
 
-    # Perform KMeans clustering
-    amounts = np.array(vendor_txns).reshape(-1, 1)
-    kmeans = KMeans(n_clusters=min(3, len(set(vendor_txns))), random_state=42).fit(amounts)
     price_cluster = kmeans.predict([[transaction.amount]])[0]
 
     return {
-        "is_fixed_amount_recurring": int(max(vendor_txns) <= min(vendor_txns) * 1.02),
+        "is_fixed_amount_recurring": is_fixed_amount_recurring,
         "amount_fluctuation": price_fluctuation,
         "price_cluster": price_cluster,
     }
 
 
-def get_user_behavior_features(transaction: Transaction, transactions: list[Transaction]) -> dict:
+def get_user_behavior_features(
+    transaction: Transaction, transactions: list[Transaction], ctx: FeatureContext | None = None
+) -> dict:
     """Extracts user-level spending behavior."""
-    user_txns = [t.amount for t in transactions if t.user_id == transaction.user_id]
+    if ctx is None:
+        user_txns = [t for t in transactions if t.user_id == transaction.user_id]
+        user_stats = _user_stats(user_txns) if user_txns else None
+    else:
+        user_stats = ctx.by_user.get(transaction.user_id)
 
-    if not user_txns:
+    if user_stats is None:
         return {"user_avg_spent": 0.0, "user_total_spent": 0.0, "user_subscription_count": 0}
 
-    # Ensure subscriptions are only counted for the given user
-    user_subscription_count = sum(t.name in RECURRING_VENDORS for t in transactions if t.user_id == transaction.user_id)
-
+    user_avg_spent, user_total_spent, user_subscription_count = user_stats
     return {
-        "user_avg_spent": mean(user_txns),
-        "user_total_spent": sum(user_txns),
+        "user_avg_spent": user_avg_spent,
+        "user_total_spent": user_total_spent,
         "user_subscription_count": user_subscription_count,
     }
 
 
-def get_refund_features(transaction: Transaction, transactions: list[Transaction]) -> dict:
+def get_refund_features(
+    transaction: Transaction, transactions: list[Transaction], ctx: FeatureContext | None = None
+) -> dict:
     """Extracts refund-related features."""
-    refunds = [t for t in transactions if t.amount == -transaction.amount]
-
-    if not refunds:
+    if ctx is None:
+        refund_dates = [parse_date_ordinal(t.date) for t in transactions if t.amount == -transaction.amount]
+        n_refunds, refund_date_sum = len(refund_dates), sum(refund_dates)
+    else:
+        n_refunds = ctx.amount_counts[-transaction.amount]
+        refund_date_sum = ctx.date_sums_by_amount.get(-transaction.amount, 0)
+
+    if not n_refunds:
         return {"refund_rate": 0.0, "avg_refund_time_lag": 0.0}
 
-    refund_time_lags = [
-        (datetime.strptime(t.date, "%Y-%m-%d") - datetime.strptime(transaction.date, "%Y-%m-%d")).days for t in refunds
-    ]
+    # mean(refund date - transaction date) == (sum of refund dates - n * transaction date) / n
+    refund_lag_total = refund_date_sum - n_refunds * parse_date_ordinal(transaction.date)
 
     return {
-        "refund_rate": len(refunds) / len(transactions),
-        "avg_refund_time_lag": mean(refund_time_lags) if refund_time_lags else 0.0,
+        "refund_rate": n_refunds / len(transactions),
+        "avg_refund_time_lag": refund_lag_total / n_refunds,
     }
 
 
-def get_monthly_spending_trend(transaction: Transaction, transactions: list[Transaction]) -> dict:
+def get_monthly_spending_trend(
+    transaction: Transaction, transactions: list[Transaction], ctx: FeatureContext | None = None
+) -> dict:
     """Calculates the total spending for the transaction's month."""
     month_year = transaction.date[:7]  # Extracts YYYY-MM
-    monthly_spending = sum(t.amount for t in transactions if t.date.startswith(month_year))
+    if ctx is None:
+        monthly_spending = sum(t.amount for t in transactions if t.date.startswith(month_year))
+    else:
+        monthly_spending = ctx.spend_by_month.get(month_year, 0.0)
 
     return {"monthly_spending_trend": monthly_spending}
+
+
+# Column order of the matrix returned by get_features_batch
+BATCH_FEATURE_NAMES = [
+    "is_biweekly",
+    "is_semimonthly",
+    "is_monthly",
+    "is_bimonthly",
+    "is_quarterly",
+    "is_annual",
+    "avg_days_between",
+    "std_days_between",
+    "recurrence_score",
+    "recurring_consistency_score",
+    "is_recurring",
+    "subscription_tier",
+    "is_fixed_amount_recurring",
+    "amount_fluctuation",
+    "price_cluster",
+    "user_avg_spent",
+    "user_total_spent",
+    "user_subscription_count",
+    "refund_rate",
+    "avg_refund_time_lag",
+    "monthly_spending_trend",
+]
+_BATCH_COLUMNS = {name: i for i, name in enumerate(BATCH_FEATURE_NAMES)}
+
+
+def _write_block(features: np.ndarray, rows: list[int], block: dict) -> None:
+    """Writes one block of named feature values into the given rows of the batch matrix."""
+    features[np.ix_(rows, [_BATCH_COLUMNS[name] for name in block])] = list(block.values())
+
+
+def get_features_batch(transactions: list[Transaction]) -> tuple[list[str], np.ndarray]:
+    """Computes this module's features for every transaction against the full list, sharing one context.
+
+    Every feature depends only on some key of the transaction (its vendor, its vendor and amount, its
+    user, its amount and date, or its month), so each feature block is computed once per distinct key
+    and written into that key's rows of a preallocated float64 matrix with one slice assignment. The
+    price clustering model is fitted once per vendor group. Columns follow BATCH_FEATURE_NAMES.
+    """
+    ctx = build_feature_context(transactions)
+    rows_by_vendor: defaultdict[str, list[int]] = defaultdict(list)
+    rows_by_vendor_amount: defaultdict[tuple[str, float], list[int]] = defaultdict(list)
+    rows_by_user: defaultdict[str, list[int]] = defaultdict(list)
+    rows_by_amount_date: defaultdict[tuple[float, str], list[int]] = defaultdict(list)
+    rows_by_month: defaultdict[str, list[int]] = defaultdict(list)
+    for i, t in enumerate(transactions):
+        rows_by_vendor[t.name].append(i)
+        rows_by_vendor_amount[t.name, t.amount].append(i)
+        rows_by_user[t.user_id].append(i)
+        rows_by_amount_date[t.amount, t.date].append(i)
+        rows_by_month[t.date[:7]].append(i)
+
+    features = np.empty((len(transactions), len(BATCH_FEATURE_NAMES)), dtype=np.float64)
+    for rows in rows_by_vendor.values():
+        t = transactions[rows[0]]
+        _write_block(
+            features,
+            rows,
+            {
+                **get_recurrence_patterns(t, transactions, ctx),
+                **get_recurring_consistency_score(t, transactions, ctx),
+                "is_recurring": validate_recurring_transaction(t),
+            },
+        )
+    for rows in rows_by_vendor_amount.values():
+        t = transactions[rows[0]]
+        _write_block(
+            features,
+            rows,
+            {"subscription_tier": classify_subscription_tier(t), **get_amount_features(t, transactions, ctx)},
+        )
+    for rows in rows_by_user.values():
+        _write_block(features, rows, get_user_behavior_features(transactions[rows[0]], transactions, ctx))
+    for rows in rows_by_amount_date.values():
+        _write_block(features, rows, get_refund_features(transactions[rows[0]], transactions, ctx))
+    for rows in rows_by_month.values():
+        _write_block(features, rows, get_monthly_spending_trend(transactions[rows[0]], transactions, ctx))
+    return list(BATCH_FEATURE_NAMES), features
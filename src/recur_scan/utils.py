@@ -8,6 +8,25 @@ def parse_date(date_str: str) -> date:
     return datetime.strptime(date_str, "%Y-%m-%d").date()
 
 
+@lru_cache(maxsize=4096)
+def parse_date_ordinal(date_str: str) -> int:
+    """Parse a zero-padded YYYY-MM-DD date string into a day ordinal (as returned by date.toordinal).
+
+    The layout is fixed, so the fields are sliced out directly instead of going through strptime. Unlike
+    parse_date, unpadded dates such as "2024-1-5" are rejected.
+    """
+    year, month, day = date_str[0:4], date_str[5:7], date_str[8:10]
+    if not (
+        len(date_str) == 10
+        and date_str[4] == date_str[7] == "-"
+        and year.isdigit()
+        and month.isdigit()
+        and day.isdigit()
+    ):
+        raise ValueError(f"time data {date_str!r} does not match format '%Y-%m-%d'")
+    return date(int(year), int(month), int(day)).toordinal()
+
+
 def get_day(date: str) -> int:
     """Get the day of the month from a transaction date."""
     return int(date.split("-")[2])
@@ -1,11 +1,17 @@
 # test features
 
+from datetime import date
+
+import numpy as np
 import pytest
 
 from recur_scan.features_emmanuel_ezechukwu2 import (
+    build_feature_context,
+    build_transaction_table,
     classify_subscription_tier,
     count_transactions_by_amount,
     get_amount_features,
+    get_features_batch,
     get_monthly_spending_trend,
     get_recurrence_patterns,
     get_recurring_consistency_score,
@@ -45,6 +51,80 @@ def sample_transactions():
     ]
 
 
+def test_build_feature_context(sample_transactions) -> None:
+    """Test build_feature_context groups transactions by vendor and user."""
+    ctx = build_feature_context(sample_transactions)
+
+    # Netflix spans both users; dates are sorted ordinals
+    netflix = ctx.by_name["Netflix"]
+    assert len(netflix.dates) == 4
+    assert list(netflix.dates) == sorted(netflix.dates)
+    assert netflix.amounts.tolist() == [14.99, 14.99, 14.99, 14.99]
+    assert ctx.by_name["Variable Sub"].amount_min == 10.00
+    assert ctx.by_name["Variable Sub"].amount_max == 15.00
+
+    # User aggregates are (avg spent, total spent, subscription count)
+    assert ctx.by_user["user2"] == (pytest.approx(47.495), pytest.approx(94.99), 0)
+    assert ctx.by_user["user1"][2] == 0  # vendor names are matched case-sensitively
+    assert ctx.amount_counts[14.99] == 4
+    assert ctx.date_sums_by_amount[-50.00] == date(2024, 1, 20).toordinal()
+    assert ctx.spend_by_month["2024-03"] == pytest.approx(14.99 + 12.50 + 9.99)
+
+    # Helpers give the same answer with a shared context as with their direct fallback
+    helpers = [
+        count_transactions_by_amount,
+        get_recurrence_patterns,
+        get_recurring_consistency_score,
+        get_amount_features,
+        get_user_behavior_features,
+        get_refund_features,
+        get_monthly_spending_trend,
+    ]
+    for t in sample_transactions:
+        for helper in helpers:
+            assert helper(t, sample_transactions, ctx) == pytest.approx(helper(t, sample_transactions))
+
+
+def test_build_transaction_table(sample_transactions) -> None:
+    """Test build_transaction_table lays transactions out as columns."""
+    table = build_transaction_table(sample_transactions)
+    assert table.vendor_names[table.name_ids[0]] == "Netflix"
+    assert table.name_ids[10] == table.name_ids[0]  # user2's Netflix shares the id
+    assert len(table.vendor_names) == 7
+    assert table.amounts.dtype == np.float64
+    assert table.amounts[5] == 10.00
+    assert table.date_ords[1] - table.date_ords[0] == 31
+
+    empty = build_transaction_table([])
+    assert len(empty.vendor_names) == 0
+    assert len(empty.date_ords) == 0
+
+
+def test_interval_stats(sample_transactions) -> None:
+    """Test VendorGroup.interval_stats summarizes the gaps between a vendor's dates once."""
+    ctx = build_feature_context(sample_transactions)
+    spotify = ctx.by_name["Spotify"]
+
+    stats = spotify.interval_stats
+    assert stats is spotify.interval_stats  # cached on the group
+    assert stats.is_monthly
+    assert not stats.is_annual
+    assert stats.avg_days_between == pytest.approx(30.0)
+
+
+def test_price_model(sample_transactions) -> None:
+    """Test VendorGroup.price_model is fitted once per vendor and skipped when there is nothing to cluster."""
+    ctx = build_feature_context(sample_transactions)
+    variable_sub = ctx.by_name["Variable Sub"]
+
+    model = variable_sub.price_model
+    assert model is not None
+    assert model is variable_sub.price_model  # cached on the group
+    assert model.n_clusters == 3
+    assert ctx.by_name["Netflix"].price_model is None  # all amounts equal
+    assert ctx.by_name["One-time"].price_model is None  # fewer than three transactions
+
+
 def test_count_transactions_by_amount(sample_transactions) -> None:
     """Test count_transactions_by_amount returns correct count and percentage."""
     # Filter to only user1's Netflix transactions at 14.99
@@ -175,3 +255,27 @@ def test_get_monthly_spending_trend(sample_transactions) -> None:
     empty_month_txn = Transaction(id=15, user_id="user1", name="Test", amount=10.00, date="2025-01-01")
     result = get_monthly_spending_trend(empty_month_txn, sample_transactions)
     assert result["monthly_spending_trend"] == 0
+
+
+def test_get_features_batch(sample_transactions) -> None:
+    """Test get_features_batch matches the per-transaction feature helpers."""
+    names, features = get_features_batch(sample_transactions)
+    assert features.shape == (len(sample_transactions), len(names))
+    assert features.dtype == np.float64
+
+    for transaction, row in zip(sample_transactions, features, strict=True):
+        expected = {
+            **get_recurrence_patterns(transaction, sample_transactions),
+            **get_recurring_consistency_score(transaction, sample_transactions),
+            "is_recurring": int(validate_recurring_transaction(transaction)),
+            "subscription_tier": classify_subscription_tier(transaction),
+            **get_amount_features(transaction, sample_transactions),
+            **get_user_behavior_features(transaction, sample_transactions),
+            **get_refund_features(transaction, sample_transactions),
+            **get_monthly_spending_trend(transaction, sample_transactions),
+        }
+        assert names == list(expected)
+        assert row.tolist() == pytest.approx(list(expected.values()))
+
+    names, features = get_features_batch([])
+    assert features.shape == (0, len(names))
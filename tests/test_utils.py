@@ -2,7 +2,7 @@ from datetime import date
 
 import pytest
 
-from recur_scan.utils import get_day, parse_date
+from recur_scan.utils import get_day, parse_date, parse_date_ordinal
 
 
 def test_parse_date():
@@ -15,6 +15,21 @@ def test_parse_date():
         parse_date("01/01/2024")
 
 
+def test_parse_date_ordinal():
+    """Test parse_date_ordinal function."""
+    assert parse_date_ordinal("2024-01-01") == date(2024, 1, 1).toordinal()
+    assert parse_date_ordinal("2024-03-01") - parse_date_ordinal("2024-02-01") == 29
+
+    # Test with invalid date formats
+    for date_str in ["01/01/2024", "2024/01/05", "2024-01-05T10:00", "2024-1-5"]:
+        with pytest.raises(ValueError, match=r"does not match format"):
+            parse_date_ordinal(date_str)
+
+    # Test with a well-formed but nonexistent date
+    with pytest.raises(ValueError, match=r"out of range"):
+        parse_date_ordinal("2024-02-30")
+
+
 def test_get_day():
     """Test get_day function."""
     assert get_day("2024-01-01") == 1